@@ -10,7 +10,7 @@ Features:
 - Keyword-Matching
 - Interaktives Interface
 
-Zeigt die Grundprinzipien von RAG ohne komplexe Dependencies.
+Zeigt die Grundprinzipien von RAG mit schlanken Dependencies (scikit-learn).
 
 Author: SAI3 Project Team
 Date: 2025
@@ -18,10 +18,53 @@ Date: 2025
 
 import os
 import re
-import math
-from collections import Counter, defaultdict
+import sys
+import mmap
+import pickle
+import heapq
+from functools import lru_cache
+from operator import itemgetter
 from typing import List, Dict, Tuple
-import json
+
+try:
+    import numpy as np
+    from scipy import sparse
+    from sklearn.feature_extraction.text import TfidfVectorizer
+except ImportError as e:
+    print(f"❌ Import Fehler: {e}")
+    print("Installiere fehlende Dependencies mit: pip install scikit-learn")
+    sys.exit(1)
+
+# Trennlinie zwischen Papers in combined_text.txt
+_PAPER_SEPARATOR = b"=" * 50
+
+# Vorkompilierte Regexes für die Hot-Loops
+# Sonderzeichen für die Wort-Bereinigung (alles außer Wortzeichen und Whitespace)
+_PUNCT_RE = re.compile(r'[^\w\s]+')
+# Satzgrenzen
+_SENT_SPLIT_RE = re.compile(r'[.!?]+')
+
+# Stoppwörter (Englisch + Deutsch), tragen kaum zur Relevanz bei.
+# Bewusst nicht sklearns ENGLISH_STOP_WORDS: die Liste enthält Fachbegriffe
+# wie "system" oder "computer".
+STOPWORDS = frozenset({
+    'the', 'and', 'for', 'with', 'that', 'this', 'these', 'those', 'are', 'was',
+    'were', 'been', 'being', 'has', 'have', 'had', 'not', 'but', 'from', 'into',
+    'onto', 'its', 'our', 'their', 'they', 'them', 'than', 'then', 'there',
+    'which', 'who', 'whom', 'what', 'when', 'where', 'why', 'how', 'can', 'could',
+    'would', 'should', 'may', 'might', 'will', 'shall', 'also', 'such', 'each',
+    'any', 'all', 'both', 'other', 'some', 'more', 'most', 'very', 'only', 'over',
+    'under', 'about', 'between', 'through', 'during', 'while', 'does', 'did',
+    'doing', 'you', 'your', 'his', 'her', 'she', 'him', 'one', 'via', 'thus',
+    'however', 'further', 'since', 'because', 'upon', 'within', 'without',
+    'der', 'die', 'das', 'den', 'dem', 'des', 'ein', 'eine', 'einer', 'eines',
+    'einem', 'einen', 'und', 'oder', 'aber', 'auch', 'als', 'auf', 'aus', 'bei',
+    'bis', 'durch', 'für', 'gegen', 'mit', 'nach', 'ohne', 'über', 'unter', 'von',
+    'vor', 'zum', 'zur', 'sich', 'sind', 'ist', 'war', 'wird', 'werden', 'wurde',
+    'wurden', 'hat', 'haben', 'hatte', 'kann', 'können', 'muss', 'nicht', 'noch',
+    'nur', 'sehr', 'wie', 'wer', 'wenn', 'dass', 'diese', 'dieser',
+    'dieses', 'diesem', 'diesen', 'sowie', 'beim', 'vom', 'man', 'welche'
+})
 
 class BasicRAGSystem:
     def __init__(self, data_dir="../"):
@@ -33,7 +76,9 @@ class BasicRAGSystem:
         """
         self.data_dir = data_dir
         self.text_file = os.path.join(data_dir, "combined_text.txt")
-        self.index_file = os.path.join(data_dir, "text_index.json")
+        self.index_file = os.path.join(data_dir, "text_index.pkl")
+        self.tfidf_file = os.path.join(data_dir, "text_tfidf.npz")
+        self.chunk_text_file = os.path.join(data_dir, "text_chunks.bin")
         
         # Überprüfe ob Textdatei existiert
         if not os.path.exists(self.text_file):
@@ -44,9 +89,16 @@ class BasicRAGSystem:
         print(f"📊 Dateigröße: {os.path.getsize(self.text_file):,} bytes")
         
         # System-Komponenten
-        self.chunks = []
-        self.word_index = defaultdict(set)  # Wort -> Set von Chunk-IDs
-        self.tf_idf_scores = {}
+        self.chunks = []  # Metadaten je Chunk (id, title, paper_id, source), ohne Text
+        self.chunk_offsets = None  # Byte-Offsets der Chunk-Texte im Blob (Länge N+1)
+        self.chunk_blob = b""  # Alle Chunk-Texte als ein UTF-8 Blob (nach dem Laden: mmap)
+        self.vectorizer = None
+        self.tfidf = None  # CSC-Matrix: Chunks x Vokabular (spaltenweise = invertierter Index)
+        
+        # Query-Cache: (query, top_k) -> ((chunk_id, score), ...)
+        self._cached_search = lru_cache(maxsize=256)(self._search_impl)
+        # Satz-Cache: chunk_id -> ((satz, wortmenge), ...)
+        self._cached_sentences = lru_cache(maxsize=1024)(self._chunk_sentences)
         
         # Lade oder erstelle Index
         self.load_or_create_index()
@@ -55,14 +107,22 @@ class BasicRAGSystem:
     
     def load_or_create_index(self):
         """Lädt bestehenden Index oder erstellt einen neuen"""
-        if os.path.exists(self.index_file):
+        index_files = [self.index_file, self.tfidf_file, self.chunk_text_file]
+        if all(os.path.exists(path) for path in index_files):
             print("📦 Lade bestehenden Index...")
             try:
-                with open(self.index_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(self.index_file, 'rb') as f:
+                    data = pickle.load(f)
                     self.chunks = data['chunks']
-                    self.word_index = {k: set(v) for k, v in data['word_index'].items()}
-                    self.tf_idf_scores = data['tf_idf_scores']
+                    self.chunk_offsets = data['chunk_offsets']
+                    self.vectorizer = data['vectorizer']
+                
+                # Chunk-Texte nicht einlesen, sondern bei Bedarf aus dem mmap dekodieren
+                if os.path.getsize(self.chunk_text_file) > 0:
+                    with open(self.chunk_text_file, 'rb') as f:
+                        self.chunk_blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                
+                self.tfidf = sparse.load_npz(self.tfidf_file).tocsc()
                 print(f"✅ Index geladen: {len(self.chunks)} Chunks")
                 return
             except:
@@ -75,48 +135,59 @@ class BasicRAGSystem:
         """Erstellt einen neuen Text-Index"""
         print("🔧 Erstelle neuen Index...")
         
-        # Lade Textdatei
-        with open(self.text_file, 'r', encoding='utf-8') as f:
-            text_content = f.read()
-        
-        print(f"📖 Textgröße: {len(text_content):,} Zeichen")
+        # Gecachte Suchergebnisse gelten nur für den alten Index
+        self._cached_search.cache_clear()
+        self._cached_sentences.cache_clear()
         
-        # Segmentierung
-        self.chunks = self.intelligent_chunking(text_content)
+        # Textdatei per Memory-Map öffnen statt komplett einzulesen
+        with open(self.text_file, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as text_content:
+                print(f"📖 Textgröße: {len(text_content):,} Bytes")
+                
+                # Segmentierung
+                self.chunks = self.intelligent_chunking(text_content)
         
-        # Erstelle Wort-Index
-        print("🔍 Erstelle Suchindex...")
-        self.build_word_index()
+        # Berechne TF-IDF Matrix
+        print("📊 Berechne TF-IDF Matrix...")
+        self.build_tfidf_matrix()
         
-        # Berechne TF-IDF Scores
-        print("📊 Berechne TF-IDF Scores...")
-        self.calculate_tf_idf()
+        # Chunk-Texte in einen zusammenhängenden Blob auslagern
+        self.pack_chunk_texts()
         
         # Speichere Index
         self.save_index()
         
         print("✅ Index erstellt und gespeichert")
     
-    def intelligent_chunking(self, text: str) -> List[Dict]:
+    def _iter_papers(self, text: mmap.mmap):
+        """Liefert die Paper-Abschnitte der Memory-Map einzeln dekodiert"""
+        start = 0
+        
+        while True:
+            end = text.find(_PAPER_SEPARATOR, start)
+            if end == -1:
+                yield text[start:].decode('utf-8', errors='ignore')
+                return
+            yield text[start:end].decode('utf-8', errors='ignore')
+            start = end + len(_PAPER_SEPARATOR)
+    
+    def intelligent_chunking(self, text: mmap.mmap) -> List[Dict]:
         """
         Intelligente Aufteilung des Textes
         
         Args:
-            text: Vollständiger Text
+            text: Memory-Map der vollständigen Textdatei
             
         Returns:
             Liste von Chunk-Dictionaries
         """
         print("🧠 Intelligente Text-Segmentierung...")
         
-        # Erkenne Paper-Grenzen
-        paper_separator = "=" * 50
-        papers = text.split(paper_separator)
-        
         chunks = []
         chunk_id = 0
         
-        for i, paper_text in enumerate(papers):
+        # Erkenne Paper-Grenzen, ohne den ganzen Text zu dekodieren
+        for i, paper_text in enumerate(self._iter_papers(text)):
             if len(paper_text.strip()) < 100:
                 continue
             
@@ -131,34 +202,40 @@ class BasicRAGSystem:
                     break
             
             # Teile Paper in Chunks auf
-            sentences = re.split(r'[.!?]+', paper_text)
-            current_chunk = ""
+            sentences = _SENT_SPLIT_RE.split(paper_text)
+            
+            # Sätze puffern und erst beim Abschluss eines Chunks einmal
+            # zusammenfügen (statt wiederholter String-Verkettung)
+            current_sentences = []
+            current_length = 0  # Länge von "Satz1. Satz2. ... SatzN. "
             
             for sentence in sentences:
                 sentence = sentence.strip()
                 if not sentence:
                     continue
                 
-                if len(current_chunk + sentence) < 800:  # Chunk-Size
-                    current_chunk += sentence + ". "
+                if current_length + len(sentence) < 800:  # Chunk-Size
+                    current_sentences.append(sentence)
+                    current_length += len(sentence) + 2
                 else:
-                    if len(current_chunk.strip()) > 100:
+                    if current_length - 1 > 100:
                         chunks.append({
                             "id": chunk_id,
-                            "text": current_chunk.strip(),
+                            "text": ". ".join(current_sentences) + ".",
                             "title": title,
                             "paper_id": f"paper_{i}",
                             "source": "combined_text.txt"
                         })
                         chunk_id += 1
                     
-                    current_chunk = sentence + ". "
+                    current_sentences = [sentence]
+                    current_length = len(sentence) + 2
             
             # Letzter Chunk
-            if len(current_chunk.strip()) > 100:
+            if current_length - 1 > 100:
                 chunks.append({
                     "id": chunk_id,
-                    "text": current_chunk.strip(),
+                    "text": ". ".join(current_sentences) + ".",
                     "title": title,
                     "paper_id": f"paper_{i}",
                     "source": "combined_text.txt"
@@ -171,76 +248,95 @@ class BasicRAGSystem:
         print(f"✅ {len(chunks)} Chunks erstellt")
         return chunks
     
-    def clean_word(self, word: str) -> str:
-        """Bereinigt ein Wort für die Indexierung"""
-        # Entferne Sonderzeichen und konvertiere zu lowercase
-        word = re.sub(r'[^\w\s]', '', word.lower())
-        return word.strip()
+    def tokenize(self, text: str) -> List[str]:
+        """Zerlegt Text in bereinigte Wörter (lowercase, ohne Sonderzeichen und Stoppwörter, > 2 Zeichen)"""
+        # Ein Regex-Durchlauf über den ganzen Text statt einer pro Wort
+        words = _PUNCT_RE.sub('', text.lower()).split()
+        return [w for w in words if len(w) > 2 and w not in STOPWORDS]
     
-    def build_word_index(self):
-        """Erstellt den Wort-zu-Chunk Index"""
-        self.word_index.clear()
+    def build_tfidf_matrix(self):
+        """Berechnet die TF-IDF Matrix aller Chunks mit scikit-learn"""
+        # Ein einziger Tokenisierungs-Durchlauf: Vokabular, Term-Frequenzen und
+        # Document-Frequenzen entstehen zusammen in fit_transform. Die Texte
+        # werden gestreamt statt vorher in eine eigene Liste kopiert.
+        texts = (chunk['text'] for chunk in self.chunks)
+        
+        # Wörter mit mindestens 3 Zeichen ohne Stoppwörter, wie bei tokenize
+        self.vectorizer = TfidfVectorizer(
+            token_pattern=r"\b\w{3,}\b",
+            lowercase=True,
+            stop_words=list(STOPWORDS),
+            sublinear_tf=True,
+            norm="l2",  # Einheitsvektoren: search() nutzt das Skalarprodukt als Cosine
+            dtype=np.float32  # halber Speicher gegenüber float64, genug für Ranking
+        )
+        # Spaltenweise speichern: jede Spalte ist die Posting-Liste eines Terms
+        self.tfidf = self.vectorizer.fit_transform(texts).tocsc()
+        
+        print(f"   📈 {self.tfidf.shape[0]} Chunks x {self.tfidf.shape[1]} Terme")
+    
+    def pack_chunk_texts(self):
+        """Verschiebt die Chunk-Texte in einen UTF-8 Blob mit Offset-Array"""
+        encoded = [chunk.pop('text').encode('utf-8') for chunk in self.chunks]
         
-        for chunk in self.chunks:
-            chunk_id = chunk['id']
-            words = chunk['text'].split()
-            
-            for word in words:
-                clean_word = self.clean_word(word)
-                if len(clean_word) > 2:  # Ignoriere sehr kurze Wörter
-                    self.word_index[clean_word].add(chunk_id)
+        self.chunk_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(text) for text in encoded], out=self.chunk_offsets[1:])
+        self.chunk_blob = b"".join(encoded)
     
-    def calculate_tf_idf(self):
-        """Berechnet TF-IDF Scores für alle Chunks"""
-        self.tf_idf_scores.clear()
-        
-        # Document frequency für jedes Wort
-        df = defaultdict(int)
-        for word, chunk_ids in self.word_index.items():
-            df[word] = len(chunk_ids)
-        
-        total_docs = len(self.chunks)
-        
-        # TF-IDF für jeden Chunk
-        for chunk in self.chunks:
-            chunk_id = chunk['id']
-            words = [self.clean_word(w) for w in chunk['text'].split()]
-            word_count = len(words)
-            
-            if word_count == 0:
-                continue
-            
-            # Term frequency
-            tf = Counter(words)
-            
-            # TF-IDF für jedes Wort im Chunk
-            chunk_scores = {}
-            for word, count in tf.items():
-                if len(word) > 2 and word in df:
-                    tf_score = count / word_count
-                    idf_score = math.log(total_docs / df[word])
-                    chunk_scores[word] = tf_score * idf_score
-            
-            self.tf_idf_scores[chunk_id] = chunk_scores
+    def chunk_text(self, chunk_id: int) -> str:
+        """Dekodiert den Text eines Chunks aus dem Blob"""
+        start, end = self.chunk_offsets[chunk_id], self.chunk_offsets[chunk_id + 1]
+        return self.chunk_blob[start:end].decode('utf-8')
+    
+    def get_chunk(self, chunk_id: int) -> Dict:
+        """Liefert einen Chunk inklusive Text"""
+        return dict(self.chunks[chunk_id], text=self.chunk_text(chunk_id))
     
     def save_index(self):
-        """Speichert den Index in eine JSON-Datei"""
+        """Speichert Metadaten und Vectorizer (Pickle), Chunk-Texte (bin) und TF-IDF Matrix (npz)"""
         try:
-            # Konvertiere sets zu lists für JSON
-            word_index_serializable = {k: list(v) for k, v in self.word_index.items()}
-            
             data = {
                 'chunks': self.chunks,
-                'word_index': word_index_serializable,
-                'tf_idf_scores': self.tf_idf_scores
+                'chunk_offsets': self.chunk_offsets,
+                'vectorizer': self.vectorizer
             }
             
-            with open(self.index_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(self.index_file, 'wb', buffering=1 << 20) as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            
+            with open(self.chunk_text_file, 'wb') as f:
+                f.write(self.chunk_blob)
+            
+            # Unkomprimiert, damit das Laden nicht dekomprimieren muss
+            sparse.save_npz(self.tfidf_file, self.tfidf, compressed=False)
                 
         except Exception as e:
             print(f"⚠️ Fehler beim Speichern des Index: {e}")
     
+    def _search_impl(self, query: str, top_k: int) -> Tuple[Tuple[int, float], ...]:
+        """Berechnet die top_k (chunk_id, score) Paare für eine Query"""
+        # Query in denselben TF-IDF Raum abbilden
+        query_vec = self.vectorizer.transform([query])
+        
+        if query_vec.nnz == 0:
+            return ()
+        
+        # Cosine-Similarity: Zeilen und Query sind L2-normiert (norm='l2'),
+        # daher genügt das Skalarprodukt. Es werden nur die Spalten
+        # (Posting-Listen) der Query-Terme gelesen, nicht die ganze Matrix.
+        scores = self.tfidf[:, query_vec.indices].dot(query_vec.data)
+        
+        # Nur Chunks mit Treffern; Top-K ohne vollständige Sortierung
+        candidates = np.flatnonzero(scores)
+        top_k = min(top_k, len(candidates))
+        if top_k == 0:
+            return ()
+        
+        top_ids = candidates[np.argpartition(scores[candidates], -top_k)[-top_k:]]
+        top_ids = top_ids[np.argsort(-scores[top_ids])]
+        
+        return tuple((int(chunk_id), float(scores[chunk_id])) for chunk_id in top_ids)
+    
     def search(self, query: str, top_k: int = 5) -> List[Tuple[Dict, float]]:
         """
         Sucht relevante Chunks für eine Query
@@ -252,30 +348,14 @@ class BasicRAGSystem:
         Returns:
             Liste von (chunk, score) Tupeln
         """
-        query_words = [self.clean_word(w) for w in query.split()]
-        query_words = [w for w in query_words if len(w) > 2]
-        
-        if not query_words:
-            return []
-        
-        # Relevanz-Scores für alle Chunks
-        chunk_scores = defaultdict(float)
-        
-        for word in query_words:
-            if word in self.word_index:
-                # Chunks die dieses Wort enthalten
-                for chunk_id in self.word_index[word]:
-                    if chunk_id in self.tf_idf_scores and word in self.tf_idf_scores[chunk_id]:
-                        chunk_scores[chunk_id] += self.tf_idf_scores[chunk_id][word]
-        
-        # Sortiere nach Score
-        sorted_chunks = sorted(chunk_scores.items(), key=lambda x: x[1], reverse=True)
+        # Wiederholte Queries kommen aus dem Cache
+        hits = self._cached_search(query, top_k)
         
         # Hole top_k Chunks
         results = []
-        for chunk_id, score in sorted_chunks[:top_k]:
-            chunk = next(c for c in self.chunks if c['id'] == chunk_id)
-            results.append((chunk, score))
+        for chunk_id, score in hits:
+            # Chunk-IDs sind fortlaufend (0..N-1) und entsprechen dem Listenindex
+            results.append((self.get_chunk(chunk_id), score))
         
         return results
     
@@ -325,6 +405,16 @@ class BasicRAGSystem:
             'sources': sources
         }
     
+    def _chunk_sentences(self, chunk_id: int) -> Tuple[Tuple[str, frozenset], ...]:
+        """Zerlegt einen Chunk in Sätze (mind. 20 Zeichen) mit ihrer Wortmenge"""
+        sentences = []
+        for sentence in _SENT_SPLIT_RE.split(self.chunk_text(chunk_id)):
+            sentence = sentence.strip()
+            if len(sentence) < 20:
+                continue
+            sentences.append((sentence, frozenset(self.tokenize(sentence))))
+        return tuple(sentences)
+    
     def generate_answer(self, question: str, results: List[Tuple[Dict, float]]) -> str:
         """
         Generiert eine Antwort basierend auf gefundenen Chunks
@@ -339,33 +429,27 @@ class BasicRAGSystem:
         if not results:
             return "Keine relevanten Informationen gefunden."
         
-        # Kombiniere die besten Chunks
+        # Die besten Chunks
         top_chunks = [chunk for chunk, score in results[:3]]
-        combined_text = " ".join([chunk['text'] for chunk in top_chunks])
         
-        # Finde relevante Sätze
-        question_words = set(self.clean_word(w) for w in question.split())
-        sentences = re.split(r'[.!?]+', combined_text)
+        # Finde relevante Sätze (zerlegte Chunks kommen aus dem Cache)
+        question_words = frozenset(self.tokenize(question))
         
         relevant_sentences = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) < 20:
-                continue
-            
-            sentence_words = set(self.clean_word(w) for w in sentence.split())
-            overlap = len(question_words.intersection(sentence_words))
-            
-            if overlap >= 1:  # Mindestens 1 gemeinsames Wort
-                relevant_sentences.append((sentence, overlap))
+        for chunk in top_chunks:
+            for sentence, sentence_words in self._cached_sentences(chunk['id']):
+                overlap = len(question_words & sentence_words)
+                
+                if overlap >= 1:  # Mindestens 1 gemeinsames Wort
+                    relevant_sentences.append((sentence, overlap))
         
-        # Sortiere nach Relevanz
-        relevant_sentences.sort(key=lambda x: x[1], reverse=True)
+        # Top 3 nach Relevanz, ohne alle Sätze zu sortieren
+        top_sentences = heapq.nlargest(3, relevant_sentences, key=itemgetter(1))
         
         # Erstelle Antwort
-        if relevant_sentences:
+        if top_sentences:
             answer = "Basierend auf den gefundenen Dokumenten:\n\n"
-            for sentence, _ in relevant_sentences[:3]:
+            for sentence, _ in top_sentences:
                 answer += f"• {sentence}.\n"
         else:
             answer = f"Die gefundenen Dokumente enthalten Informationen zu '{question}', aber keine direkten Antworten."
@@ -394,7 +478,7 @@ class BasicRAGSystem:
                 if question.lower() == 'stats':
                     print(f"📊 System-Statistiken:")
                     print(f"   Chunks: {len(self.chunks)}")
-                    print(f"   Indexierte Wörter: {len(self.word_index)}")
+                    print(f"   Indexierte Wörter: {len(self.vectorizer.vocabulary_)}")
                     continue
                 
                 if not question:
@@ -2,6 +2,10 @@ import arxiv
 import requests
 import os
 import sys
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 sys.stdout.reconfigure(encoding='utf-8')  # Fix für Unicode-Fehler
 # Erstelle einen Ordner für die PDFs auf dem Desktop
 save_directory = r"/Users/mdni/PycharmProjects/SAI3/Data/PDF_Data"
@@ -15,20 +19,30 @@ search = arxiv.Search(
 # Verwende die neue Methode `Client().results()`
 from arxiv import Client
 client = Client()
-# PDFs herunterladen
-for paper in client.results(search):
+# Eine Session für alle Downloads (Keep-Alive, Connection-Pool, Retries)
+session = requests.Session()
+adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=Retry(total=3, backoff_factor=0.5))
+session.mount("http://", adapter)
+session.mount("https://", adapter)
+# Lädt ein einzelnes Paper herunter
+def fetch(paper):
    pdf_url = paper.pdf_url
    print(f"PDF URL: {pdf_url}")  # Gibt die URL aus, bevor du die Datei herunterlädst
    # Bereinigung des Dateinamens
    pdf_filename = os.path.join(save_directory, f"{paper.title.replace(' ', '_').replace('/', '_').replace(':', '_').replace('?', '_')}.pdf")
    try:
-       response = requests.get(pdf_url)
-       # Prüfe, ob der Download erfolgreich war
-       if response.status_code == 200:
-           with open(pdf_filename, "wb") as f:
-               f.write(response.content)
-           print(f"PDF gespeichert: {pdf_filename}")
-       else:
-           print(f"Fehler beim Herunterladen der Datei {pdf_filename}. Status Code: {response.status_code}")
+       # Streamen statt die ganze PDF im Speicher zu puffern
+       with session.get(pdf_url, stream=True, timeout=30) as response:
+           # Prüfe, ob der Download erfolgreich war
+           if response.status_code == 200:
+               response.raw.decode_content = True  # Entpackt ggf. gzip/deflate
+               with open(pdf_filename, "wb") as f:
+                   shutil.copyfileobj(response.raw, f, length=1 << 16)
+               print(f"PDF gespeichert: {pdf_filename}")
+           else:
+               print(f"Fehler beim Herunterladen der Datei {pdf_filename}. Status Code: {response.status_code}")
    except Exception as e:
-       print(f"Fehler beim Herunterladen der Datei {pdf_filename}: {e}")
\ No newline at end of file
+       print(f"Fehler beim Herunterladen der Datei {pdf_filename}: {e}")
+# PDFs parallel herunterladen (I/O-gebunden, daher Threads)
+with ThreadPoolExecutor(max_workers=8) as executor:
+   executor.map(fetch, client.results(search))
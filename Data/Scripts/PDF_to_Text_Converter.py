@@ -12,13 +12,17 @@ import os
 import re
 import sys
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 
 try:
-    import PyPDF2
+    import pypdfium2 as pdfium
 except ImportError:
-    print("PyPDF2 nicht installiert. Installiere mit: pip install PyPDF2")
+    print("pypdfium2 nicht installiert. Installiere mit: pip install pypdfium2")
     sys.exit(1)
 
+# Vorkompilierte Regex für die Wortzählung (\b an den Rändern von \w+ ist implizit)
+_WORD_RE = re.compile(r"\w+")
+
 def clean_text(text):
     """Bereinigt Text von problematischen Unicode-Zeichen"""
     # Entferne Surrogates und andere problematische Zeichen
@@ -32,13 +36,12 @@ def clean_text(text):
 def extract_text_from_pdf(pdf_path):
     """Extrahiert Text aus einer PDF-Datei"""
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text
+        # PDFium (C++) statt reinem Python-Parser
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            text = "".join(page.get_textpage().get_text_range() for page in pdf)
+        finally:
+            pdf.close()
         # Text bereinigen
         text = clean_text(text)
         return text
@@ -46,6 +49,13 @@ def extract_text_from_pdf(pdf_path):
         print(f"Fehler beim Verarbeiten von {pdf_path}: {e}")
         return ""
 
+def extract_and_count_words(pdf_path):
+    """Extrahiert den Text einer PDF und zählt seine Wörter (im Worker-Prozess)"""
+    text = extract_text_from_pdf(pdf_path)
+    # Wörter zählen, ohne eine Liste aller Wörter anzulegen
+    num_words = sum(1 for _ in _WORD_RE.finditer(text))
+    return text, num_words
+
 def main():
     """Hauptfunktion für die PDF-zu-Text Konvertierung"""
     # Dynamischer Pfad basierend auf aktuellem Script-Verzeichnis
@@ -71,42 +81,52 @@ def main():
         sys.exit(1)
 
     # Durchlaufe PDFs im Ordner
-    pdf_files = [f for f in sorted(os.listdir(pdf_folder)) if f.endswith(".pdf")]
+    # scandir liefert Name und Pfad in einem Durchlauf (Dateityp ohne extra stat)
+    with os.scandir(pdf_folder) as entries:
+        pdf_entries = sorted(
+            (entry for entry in entries if entry.name.endswith(".pdf") and entry.is_file()),
+            key=lambda entry: entry.name
+        )
+    pdf_files = [entry.name for entry in pdf_entries]
+    pdf_paths = [entry.path for entry in pdf_entries]
     print(f"📚 Gefundene PDF Dateien: {len(pdf_files)}")
-    print("🔄 Starte Verarbeitung...\n")
-
-    for filename in pdf_files:
-        pdf_path = os.path.join(pdf_folder, filename)
-        print(f"📖 Verarbeite: {filename}")
-        text = extract_text_from_pdf(pdf_path)
-
-        if text and text.strip():  # Nur wenn Text extrahiert wurde und nicht leer ist
-            # Wörter zählen
-            words = re.findall(r"\b\w+\b", text)
-            num_words = len(words)
-            
-            if total_words + num_words <= word_limit:
-                all_text.append(f"=== {filename} ===\n{text}")
-                total_words += num_words
-                print(f"  ✅ {num_words:,} Wörter hinzugefügt (Gesamt: {total_words:,})")
-            else:
-                remaining_words = word_limit - total_words
-                if remaining_words > 0:
-                    all_text.append(f"=== {filename} ===\n" + " ".join(words[:remaining_words]))
-                    total_words += remaining_words
-                    print(f"  🔚 Limit erreicht mit Datei: {filename}")
-                break
+    print(f"🔄 Starte Verarbeitung mit {os.cpu_count()} Prozessen...\n")
+
+    # Extraktion und Wortzählung parallel, Wort-Limit im Hauptprozess in Dateireihenfolge
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(extract_and_count_words, pdf_paths, chunksize=4)
+
+        for filename, (text, num_words) in zip(pdf_files, results):
+            print(f"📖 Verarbeite: {filename}")
+
+            if text and text.strip():  # Nur wenn Text extrahiert wurde und nicht leer ist
+                if total_words + num_words <= word_limit:
+                    all_text.append(f"=== {filename} ===\n{text}")
+                    total_words += num_words
+                    print(f"  ✅ {num_words:,} Wörter hinzugefügt (Gesamt: {total_words:,})")
+                else:
+                    remaining_words = word_limit - total_words
+                    if remaining_words > 0:
+                        # Wortliste nur für die letzte, gekürzte Datei erzeugen
+                        words = _WORD_RE.findall(text)
+                        all_text.append(f"=== {filename} ===\n" + " ".join(words[:remaining_words]))
+                        total_words += remaining_words
+                        print(f"  🔚 Limit erreicht mit Datei: {filename}")
+                    # Restliche PDFs werden nicht mehr benötigt
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
 
     print(f"\n📊 Gesamtanzahl Wörter: {total_words:,}")
 
     # Speichern als TXT mit besserer Fehlerbehandlung
     try:
-        combined_text = "\n\n".join(all_text)
-        # Nochmal bereinigen vor dem Speichern
-        combined_text = clean_text(combined_text)
-        
+        # Texte sind bereits in extract_text_from_pdf bereinigt; direkt schreiben,
+        # statt einen großen Gesamt-String zu bauen und erneut zu bereinigen
         with open(output_text_file, "w", encoding="utf-8", errors='ignore') as f:
-            f.write(combined_text)
+            for i, text in enumerate(all_text):
+                if i > 0:
+                    f.write("\n\n")
+                f.write(text)
         print(f"✅ Text erfolgreich gespeichert in: {output_text_file}")
         
         # Dateigröße anzeigen
@@ -16,15 +16,183 @@ Date: 2025
 
 import os
 import re
+import mmap
+import pickle
+import numpy as np
 import chromadb
-from llama_index.core import Document, VectorStoreIndex, Settings
+from collections import OrderedDict
+from typing import List
+from pydantic import PrivateAttr
+from llama_index.core import Document, VectorStoreIndex, Settings, QueryBundle
+from llama_index.core.embeddings import BaseEmbedding
 from llama_index.vector_stores.chroma import ChromaVectorStore
-from llama_index.core.storage.storage_context import StorageContext
+from llama_index.core.schema import MetadataMode
+from llama_index.core.vector_stores.utils import node_to_metadata_dict
 from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from llama_index.core.node_parser import SentenceSplitter
+from concurrent.futures import ProcessPoolExecutor
 import warnings
 warnings.filterwarnings("ignore")
 
+# Optional: GPU-Inferenz in FP16 (nur mit CUDA-fähiger Grafikkarte)
+try:
+    import torch
+    from sentence_transformers import SentenceTransformer
+    CUDA_AVAILABLE = torch.cuda.is_available()
+except ImportError:
+    CUDA_AVAILABLE = False
+
+# Optional: ONNX Runtime mit int8-quantisiertem Modell (fallback auf HuggingFace)
+try:
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+    print("⚠️ ONNX Runtime nicht verfügbar - verwende HuggingFace Embeddings")
+
+# Lokales Embedding-Modell (Dokumente und Queries nutzen dasselbe Modell)
+EMBED_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+ONNX_MODEL_DIR = "../minilm_onnx"
+ONNX_MODEL_FILE = "model_quantized.onnx"
+
+# Trennlinie zwischen Papers in combined_text.txt
+PAPER_SEPARATOR = b"=" * 50
+
+# Parallele Chunk-Aufteilung erst ab dieser Anzahl Papers (Start der Worker-Prozesse kostet Zeit)
+PARALLEL_MIN_PAPERS = 64
+
+# Chunks pro ChromaDB-Insert (bleibt unter dem SQLite-Parameterlimit)
+CHROMA_BATCH_SIZE = 5000
+
+# HNSW-Index der Collection: Kosinus-Distanz (Embeddings sind normalisiert) und feste ef-Werte
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64
+}
+
+# Antwort-Cache: Anzahl Einträge (LRU) und Ähnlichkeitsschwelle für Paraphrasen
+QUERY_CACHE_SIZE = 1024
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+def export_quantized_onnx(save_dir=ONNX_MODEL_DIR):
+    """
+    Exportiert MiniLM nach ONNX und quantisiert es dynamisch auf int8
+    
+    Benötigt einmalig `pip install optimum[onnxruntime]`.
+    """
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    
+    print("📦 Exportiere MiniLM nach ONNX (int8)...")
+    
+    model = ORTModelForFeatureExtraction.from_pretrained(EMBED_MODEL_NAME, export=True)
+    quantizer = ORTQuantizer.from_pretrained(model)
+    quantizer.quantize(
+        save_dir=save_dir,
+        quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    )
+    AutoTokenizer.from_pretrained(EMBED_MODEL_NAME).save_pretrained(save_dir)
+    
+    print(f"✅ ONNX-Modell gespeichert: {save_dir}")
+
+def create_node_parser():
+    """SentenceSplitter für feinere Chunks (bessere Retrieval-Performance)"""
+    return SentenceSplitter(
+        chunk_size=512,
+        chunk_overlap=50,
+        separator=" "
+    )
+
+_node_parser = None
+
+def _split_document(document):
+    """Teilt ein Paper in Chunks (läuft im Worker-Prozess, Splitter wird pro Prozess einmal erstellt)"""
+    global _node_parser
+    if _node_parser is None:
+        _node_parser = create_node_parser()
+    return _node_parser.get_nodes_from_documents([document])
+
+class CudaMiniLMEmbedding(BaseEmbedding):
+    """MiniLM-Embeddings auf der GPU in FP16"""
+    
+    _model: object = PrivateAttr()
+    
+    def __init__(self, **kwargs):
+        super().__init__(model_name=EMBED_MODEL_NAME, **kwargs)
+        
+        # TF32 für verbleibende FP32-Matmuls erlauben
+        torch.backends.cuda.matmul.allow_tf32 = True
+        self._model = SentenceTransformer(EMBED_MODEL_NAME, device="cuda").half()
+    
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        embeddings = self._model.encode(
+            texts,
+            batch_size=self.embed_batch_size,
+            convert_to_tensor=True,
+            normalize_embeddings=True
+        )
+        return embeddings.float().cpu().numpy().tolist()
+    
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._encode([query])[0]
+    
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+    
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._encode([text])[0]
+    
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(texts)
+
+class OnnxMiniLMEmbedding(BaseEmbedding):
+    """MiniLM-Embeddings über ONNX Runtime (int8) mit Mean-Pooling in numpy"""
+    
+    _session: object = PrivateAttr()
+    _tokenizer: object = PrivateAttr()
+    _input_names: set = PrivateAttr()
+    
+    def __init__(self, model_dir=ONNX_MODEL_DIR, **kwargs):
+        super().__init__(model_name=EMBED_MODEL_NAME, **kwargs)
+        
+        if not os.path.exists(os.path.join(model_dir, ONNX_MODEL_FILE)):
+            export_quantized_onnx(model_dir)
+        
+        self._tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self._session = ort.InferenceSession(
+            os.path.join(model_dir, ONNX_MODEL_FILE),
+            providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self._session.get_inputs()}
+    
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        inputs = self._tokenizer(
+            texts, padding=True, truncation=True, max_length=256, return_tensors="np"
+        )
+        feed = {name: value.astype(np.int64) for name, value in inputs.items() if name in self._input_names}
+        token_embeddings = self._session.run(None, feed)[0]
+        
+        # Mean-Pooling über echte Tokens, danach L2-Normalisierung
+        mask = inputs["attention_mask"][..., None].astype(np.float32)
+        embeddings = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings.tolist()
+    
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._encode([query])[0]
+    
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+    
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._encode([text])[0]
+    
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(texts)
+
 class RAGSystem:
     def __init__(self, data_dir="../", collection_name="cyber_security_papers"):
         """
@@ -37,6 +205,8 @@ class RAGSystem:
         self.data_dir = data_dir
         self.collection_name = collection_name
         self.text_file = os.path.join(data_dir, "combined_text.txt")
+        self.nodes_file = os.path.join(data_dir, "llama_nodes.pkl")
+        self.embedding_file = os.path.join(data_dir, "llama_embeddings_fp16.npy")
         
         # Überprüfe ob Textdatei existiert
         if not os.path.exists(self.text_file):
@@ -45,17 +215,25 @@ class RAGSystem:
         print(f"📚 RAG-System wird initialisiert...")
         print(f"📁 Datenquelle: {self.text_file}")
         
+        # Antwort-Cache: exakte Frage -> Antwort, Query-Embedding -> Antwort
+        self._exact_cache = OrderedDict()
+        self._semantic_cache = OrderedDict()
+        
         # Setup Embeddings (lokal, ohne API-Keys)
         self.setup_embeddings()
         
         # Setup Vector Store
         self.setup_vector_store()
         
-        # Lade und verarbeite Dokumente
-        self.load_and_process_documents()
+        # Lade Chunks und Embeddings aus dem Cache oder verarbeite Dokumente neu
+        rebuild = not self.load_cached_embeddings()
+        if rebuild:
+            self.load_and_process_documents()
+            self.embed_nodes()
+            self.save_cached_embeddings()
         
         # Erstelle Index
-        self.create_index()
+        self.create_index(rebuild=rebuild)
         
         print("✅ RAG-System erfolgreich initialisiert!")
     
@@ -64,11 +242,29 @@ class RAGSystem:
         print("🔧 Setup Embeddings...")
         
         # Verwende lokales Embedding-Modell (kein OpenAI API-Key nötig)
-        embed_model = HuggingFaceEmbedding(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
-        )
+        embed_model = None
+        if CUDA_AVAILABLE:
+            try:
+                embed_model = CudaMiniLMEmbedding(embed_batch_size=256)
+                print("⚡ GPU (CUDA, FP16) aktiv")
+            except Exception as e:
+                print(f"⚠️ GPU nicht nutzbar ({e}) - verwende CPU")
+        
+        if embed_model is None and ONNX_AVAILABLE:
+            try:
+                embed_model = OnnxMiniLMEmbedding(embed_batch_size=64)
+                print("⚡ ONNX Runtime (int8) aktiv")
+            except Exception as e:
+                print(f"⚠️ ONNX-Modell nicht nutzbar ({e}) - verwende HuggingFace")
+        
+        if embed_model is None:
+            embed_model = HuggingFaceEmbedding(
+                model_name=EMBED_MODEL_NAME,
+                embed_batch_size=64
+            )
         
         # Setze globale Settings für LlamaIndex
+        self.embed_model = embed_model
         Settings.embed_model = embed_model
         
         # Chunk-Size für bessere Performance
@@ -77,36 +273,66 @@ class RAGSystem:
         
         print("✅ Embeddings konfiguriert")
     
-    def setup_vector_store(self):
-        """Setup ChromaDB Vector Store"""
+    def setup_vector_store(self, reset=False):
+        """
+        Setup ChromaDB Vector Store
+        
+        Args:
+            reset: Bestehende Collection vorher löschen
+        """
         print("🗄️ Setup Vector Store...")
         
         # ChromaDB Client (persistent local storage)
-        chroma_client = chromadb.PersistentClient(path="../chroma_db")
+        self.chroma_client = chromadb.PersistentClient(path="../chroma_db")
+        
+        if reset:
+            try:
+                self.chroma_client.delete_collection(self.collection_name)
+            except Exception:
+                pass  # Collection existiert noch nicht
         
         # Collection erstellen oder laden
-        chroma_collection = chroma_client.get_or_create_collection(self.collection_name)
+        self.chroma_collection = self.chroma_client.get_or_create_collection(
+            self.collection_name,
+            metadata=HNSW_METADATA
+        )
         
         # Vector Store wrapper für LlamaIndex
-        self.vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
+        self.vector_store = ChromaVectorStore(chroma_collection=self.chroma_collection)
         
         print("✅ Vector Store konfiguriert")
     
+    def _iter_papers(self, text):
+        """Liefert die Paper-Abschnitte der Memory-Map einzeln dekodiert"""
+        start = 0
+        
+        while True:
+            end = text.find(PAPER_SEPARATOR, start)
+            paper_text = (text[start:] if end == -1 else text[start:end]).decode('utf-8')
+            
+            # Zeilenenden wie beim Lesen im Textmodus vereinheitlichen
+            if '\r' in paper_text:
+                paper_text = paper_text.replace('\r\n', '\n').replace('\r', '\n')
+            yield paper_text
+            
+            if end == -1:
+                return
+            start = end + len(PAPER_SEPARATOR)
+    
     def intelligent_text_chunking(self, text):
         """
         Intelligente Aufteilung des Textes respektiert Paper-Grenzen
         
         Args:
-            text: Vollständiger Text aus combined_text.txt
+            text: Memory-Map von combined_text.txt (Papers werden einzeln dekodiert)
             
         Returns:
             List von Document-Objekten mit Metadaten
         """
         print("🧠 Intelligente Text-Segmentierung...")
         
-        # Erkenne Paper-Grenzen basierend auf Mustern
-        paper_separator = "=" * 50
-        papers = text.split(paper_separator)
+        # Erkenne Paper-Grenzen basierend auf Mustern, ohne den ganzen Text zu dekodieren
+        papers = self._iter_papers(text)
         
         documents = []
         paper_count = 0
@@ -118,7 +344,7 @@ class RAGSystem:
             paper_count += 1
             
             # Extrahiere Titel (erste Zeile nach Bereinigung)
-            lines = paper_text.strip().split('\n')
+            lines = paper_text.strip().split('\n', 5)
             title = "Unknown Paper"
             
             for line in lines[:5]:  # Suche in ersten 5 Zeilen nach Titel
@@ -151,41 +377,152 @@ class RAGSystem:
         """Lädt und verarbeitet die Textdateien"""
         print("📖 Lade und verarbeite Dokumente...")
         
-        # Lade Textdatei
-        with open(self.text_file, 'r', encoding='utf-8') as f:
-            text_content = f.read()
+        # Textdatei per Memory-Map öffnen: der Gesamttext liegt nie als String im Speicher
+        self.documents = []
+        print(f"📊 Textgröße: {os.path.getsize(self.text_file):,} Bytes")
         
-        print(f"📊 Textgröße: {len(text_content):,} Zeichen")
-        
-        # Intelligente Segmentierung
-        self.documents = self.intelligent_text_chunking(text_content)
-        
-        # Weitere Aufteilung in kleinere Chunks für bessere Retrieval-Performance
-        node_parser = SentenceSplitter(
-            chunk_size=512,
-            chunk_overlap=50,
-            separator=" "
-        )
+        if os.path.getsize(self.text_file) > 0:
+            with open(self.text_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)  # Aggressives Read-Ahead (Linux/macOS)
+                
+                # Intelligente Segmentierung
+                self.documents = self.intelligent_text_chunking(mm)
         
+        # Weitere Aufteilung in kleinere Chunks, bei vielen Papers parallel auf allen Kernen
         print("🔄 Erstelle feinere Chunks...")
-        self.nodes = node_parser.get_nodes_from_documents(self.documents)
+        if len(self.documents) >= PARALLEL_MIN_PAPERS:
+            with ProcessPoolExecutor() as executor:
+                self.nodes = [
+                    node
+                    for nodes in executor.map(_split_document, self.documents, chunksize=8)
+                    for node in nodes
+                ]
+        else:
+            self.nodes = create_node_parser().get_nodes_from_documents(self.documents)
         
         print(f"✅ {len(self.nodes)} Chunks erstellt")
     
-    def create_index(self):
-        """Erstellt den Vector Store Index"""
-        print("🔍 Erstelle Vector Store Index...")
+    def embed_nodes(self):
+        """
+        Berechnet die Embeddings aller Chunks in einem Durchlauf
         
-        # Storage Context mit ChromaDB
-        storage_context = StorageContext.from_defaults(vector_store=self.vector_store)
+        Die Texte werden nach Länge sortiert kodiert, damit jeder Batch
+        ähnlich lange Texte enthält und kaum Padding-Tokens anfallen.
+        """
+        print("🧮 Berechne Embeddings...")
         
-        # Erstelle Index
-        self.index = VectorStoreIndex(
-            self.nodes,
-            storage_context=storage_context,
-            show_progress=True
+        # Gleicher Text wie beim LlamaIndex-Embedding: Metadaten (z.B. Titel) + Chunk-Text
+        texts = [node.get_content(metadata_mode=MetadataMode.EMBED) for node in self.nodes]
+        
+        # Identische Texte nur einmal embedden (Text -> Index in unique_texts)
+        unique_ids = {}
+        inverse = np.fromiter(
+            (unique_ids.setdefault(text, len(unique_ids)) for text in texts),
+            dtype=np.intp,
+            count=len(texts)
+        )
+        unique_texts = list(unique_ids)
+        
+        order = np.argsort([len(text) for text in unique_texts], kind="stable")
+        
+        sorted_embeddings = np.asarray(
+            self.embed_model.get_text_embedding_batch(
+                [unique_texts[i] for i in order],
+                show_progress=True
+            ),
+            dtype=np.float32
         )
         
+        # Ursprüngliche Reihenfolge wiederherstellen und Duplikate auffüllen
+        unique_embeddings = np.empty_like(sorted_embeddings)
+        unique_embeddings[order] = sorted_embeddings
+        self.embeddings = unique_embeddings[inverse]
+        
+        duplicates = len(texts) - len(unique_texts)
+        print(f"✅ {len(texts)} Embeddings berechnet ({duplicates} Duplikate übersprungen)")
+    
+    def save_cached_embeddings(self):
+        """Speichert Chunks (Pickle) und Embeddings (float16 .npy) für den nächsten Start"""
+        with open(self.nodes_file, 'wb') as f:
+            pickle.dump(self.nodes, f, protocol=pickle.HIGHEST_PROTOCOL)
+        np.save(self.embedding_file, self.embeddings.astype(np.float16))
+        
+        print(f"💾 Embeddings gespeichert: {self.embedding_file}")
+    
+    def load_cached_embeddings(self):
+        """
+        Lädt Chunks und Embeddings aus dem Cache
+        
+        Returns:
+            True wenn der Cache aktueller als combined_text.txt ist und geladen wurde
+        """
+        cache_files = [self.nodes_file, self.embedding_file]
+        if not all(os.path.exists(path) for path in cache_files):
+            return False
+        if min(os.path.getmtime(path) for path in cache_files) < os.path.getmtime(self.text_file):
+            print("🔄 Textdatei wurde geändert - Cache wird neu erstellt")
+            return False
+        
+        print("📂 Lade Chunks und Embeddings aus dem Cache...")
+        
+        with open(self.nodes_file, 'rb') as f:
+            self.nodes = pickle.load(f)
+        
+        # Memory-mapped: das Betriebssystem lädt nur die tatsächlich gelesenen Seiten
+        self.embeddings = np.load(self.embedding_file, mmap_mode='r')
+        
+        print(f"✅ {len(self.nodes)} Chunks aus dem Cache geladen")
+        return True
+    
+    def insert_nodes(self):
+        """Schreibt Chunks mit ihren Embeddings blockweise per Bulk-Insert in ChromaDB"""
+        print("📥 Schreibe Chunks in ChromaDB...")
+        
+        embeddings = np.asarray(self.embeddings, dtype=np.float32)
+        
+        for start in range(0, len(self.nodes), CHROMA_BATCH_SIZE):
+            batch = self.nodes[start:start + CHROMA_BATCH_SIZE]
+            
+            # Gleiches Metadatenformat wie ChromaVectorStore.add, damit LlamaIndex die Nodes rekonstruieren kann
+            metadatas = []
+            for node in batch:
+                metadata = node_to_metadata_dict(node, remove_text=True, flat_metadata=True)
+                metadatas.append({key: "" if value is None else value for key, value in metadata.items()})
+            
+            self.chroma_collection.add(
+                ids=[node.node_id for node in batch],
+                embeddings=embeddings[start:start + CHROMA_BATCH_SIZE],
+                metadatas=metadatas,
+                documents=[node.get_content(metadata_mode=MetadataMode.NONE) for node in batch]
+            )
+        
+        print(f"✅ {len(self.nodes)} Chunks gespeichert")
+    
+    def create_index(self, rebuild=True):
+        """
+        Erstellt den Vector Store Index
+        
+        Args:
+            rebuild: Chunks wurden neu erstellt, Collection muss neu befüllt werden
+        """
+        print("🔍 Erstelle Vector Store Index...")
+        
+        collection_space = (self.chroma_collection.metadata or {}).get("hnsw:space")
+        if (not rebuild and self.chroma_collection.count() == len(self.nodes)
+                and collection_space == HNSW_METADATA["hnsw:space"]):
+            # Collection ist bereits mit denselben Chunks (und Kosinus-HNSW) befüllt
+            print("♻️ Verwende bestehende ChromaDB Collection")
+            self.index = VectorStoreIndex.from_vector_store(self.vector_store)
+        else:
+            # Veraltete Einträge entfernen statt sie zu duplizieren
+            if self.chroma_collection.count() > 0:
+                self.setup_vector_store(reset=True)
+            
+            # Vorab berechnete Embeddings direkt in die Collection schreiben
+            self.insert_nodes()
+            self.index = VectorStoreIndex.from_vector_store(self.vector_store)
+        
         # Query Engine für Retrieval
         self.query_engine = self.index.as_query_engine(
             similarity_top_k=5,  # Top 5 ähnlichste Chunks
@@ -194,6 +531,44 @@ class RAGSystem:
         
         print("✅ Index erstellt und Query Engine bereit")
     
+    def tune_search_ef(self, questions, top_k=5, target_recall=0.95, ef_values=(16, 32, 64, 128, 256)):
+        """
+        Sucht das kleinste HNSW search_ef, das die gewünschte Recall erreicht
+        
+        Args:
+            questions: Beispiel-Fragen für die Messung
+            top_k: Anzahl Treffer pro Frage
+            target_recall: Mindestanteil der exakten Top-K, die HNSW finden muss
+            ef_values: Zu testende search_ef-Werte (aufsteigend)
+            
+        Returns:
+            Gewähltes search_ef (ist danach in der Collection gesetzt)
+        """
+        print("🎛️ Kalibriere HNSW search_ef...")
+        
+        node_ids = np.array([node.node_id for node in self.nodes])
+        embeddings = np.asarray(self.embeddings, dtype=np.float32)
+        queries = np.asarray(
+            [self.embed_model.get_query_embedding(question) for question in questions],
+            dtype=np.float32
+        )
+        
+        # Exakte Top-K als Referenz (Skalarprodukt = Kosinus bei normalisierten Vektoren)
+        scores = queries @ embeddings.T
+        kth = min(top_k, len(node_ids)) - 1
+        exact = [set(node_ids[np.argpartition(-row, kth)[:top_k]]) for row in scores]
+        
+        for ef in ef_values:
+            self.chroma_collection.modify(configuration={"hnsw": {"ef_search": ef}})
+            found = self.chroma_collection.query(query_embeddings=queries, n_results=top_k, include=[])["ids"]
+            recall = np.mean([len(expected & set(ids)) / top_k for expected, ids in zip(exact, found)])
+            print(f"   ef={ef}: Recall {recall:.3f}")
+            if recall >= target_recall:
+                break
+        
+        print(f"✅ search_ef = {ef}")
+        return ef
+    
     def query(self, question):
         """
         Stelle eine Frage an das RAG-System
@@ -205,9 +580,25 @@ class RAGSystem:
             Antwort des RAG-Systems
         """
         print(f"\n🤔 Frage: {question}")
-        print("🔍 Suche relevante Informationen...")
         
-        response = self.query_engine.query(question)
+        key = " ".join(question.lower().split())
+        response = self._cache_lookup(self._exact_cache, key)
+        
+        if response is None:
+            # Query nur einmal embedden: für den semantischen Cache und das Retrieval
+            query_embedding = np.asarray(self.embed_model.get_query_embedding(question), dtype=np.float32)
+            response = self._semantic_lookup(query_embedding)
+            
+            if response is None:
+                print("🔍 Suche relevante Informationen...")
+                response = self.query_engine.query(
+                    QueryBundle(query_str=question, embedding=query_embedding.tolist())
+                )
+                self._cache_store(self._semantic_cache, key, (query_embedding, response))
+            
+            self._cache_store(self._exact_cache, key, response)
+        else:
+            print("⚡ Antwort aus Cache")
         
         print(f"💡 Antwort: {response.response}")
         
@@ -221,6 +612,39 @@ class RAGSystem:
         
         return response
     
+    def _semantic_lookup(self, query_embedding):
+        """Sucht eine gespeicherte Antwort zu einer sehr ähnlichen Frage"""
+        if not self._semantic_cache:
+            return None
+        
+        keys = list(self._semantic_cache)
+        vectors = np.stack([self._semantic_cache[k][0] for k in keys])
+        
+        # Embeddings sind L2-normalisiert: Skalarprodukt = Kosinus-Ähnlichkeit
+        similarities = vectors @ query_embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < SEMANTIC_CACHE_THRESHOLD:
+            return None
+        
+        print(f"⚡ Antwort aus Cache (Ähnlichkeit: {similarities[best]:.3f})")
+        return self._cache_lookup(self._semantic_cache, keys[best])[1]
+    
+    @staticmethod
+    def _cache_lookup(cache, key):
+        """Liest einen Cache-Eintrag und markiert ihn als zuletzt benutzt"""
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+    
+    @staticmethod
+    def _cache_store(cache, key, value):
+        """Speichert einen Cache-Eintrag und verdrängt den ältesten (LRU)"""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > QUERY_CACHE_SIZE:
+            cache.popitem(last=False)
+    
     def interactive_mode(self):
         """Startet interaktiven Frage-Modus"""
         print("\n" + "="*60)
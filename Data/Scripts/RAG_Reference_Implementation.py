@@ -17,13 +17,27 @@ Date: 2025
 """
 
 import os
-import json
+import sys
+import mmap
+import pickle
 import re
+import heapq
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
 from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 import warnings
 warnings.filterwarnings("ignore")
 
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError as e:
+    print(f"❌ Import Fehler: {e}")
+    print("Installiere fehlende Dependencies mit: pip install scikit-learn")
+    sys.exit(1)
+
 # Optional: OpenAI Integration (fallback auf lokale Generation)
 try:
     import openai
@@ -32,6 +46,27 @@ except ImportError:
     OPENAI_AVAILABLE = False
     print("⚠️ OpenAI nicht verfügbar - verwende lokale Generierung")
 
+# Optional: Dense Retrieval mit FAISS und MiniLM (fallback auf TF-IDF)
+try:
+    import faiss
+    from sentence_transformers import SentenceTransformer
+    DENSE_AVAILABLE = True
+except ImportError:
+    DENSE_AVAILABLE = False
+    print("⚠️ FAISS nicht verfügbar - verwende TF-IDF Retrieval")
+
+# Satzzeichen (alles außer Wortzeichen und Whitespace)
+_PUNCT_RE = re.compile(r'[^\w\s]')
+# Sätze: Abschnitte zwischen Satzendezeichen
+_SENT_RE = re.compile(r'[^.!?]+')
+
+# Maximale Anzahl gecachter Antworten und Retrieval-Ergebnisse (LRU)
+QUERY_CACHE_SIZE = 1024
+
+# Dense Retrieval: Embedding-Modell und Korpusgröße ab der HNSW statt exakter Suche genutzt wird
+EMBED_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+HNSW_MIN_CHUNKS = 100_000
+
 @dataclass
 class RetrievalResult:
     """Struktur für Retrieval-Ergebnisse"""
@@ -66,7 +101,10 @@ class RAGReferenceSystem:
         """
         self.data_dir = data_dir
         self.text_file = os.path.join(data_dir, "combined_text.txt")
-        self.index_file = os.path.join(data_dir, "text_index.json")
+        self.index_file = os.path.join(data_dir, "text_index.pkl")
+        self.tfidf_file = os.path.join(data_dir, "text_tfidf.npz")
+        self.chunk_text_file = os.path.join(data_dir, "text_chunks.bin")
+        self.embedding_file = os.path.join(data_dir, "text_embeddings.npy")
         
         # OpenAI Setup (optional)
         if openai_api_key and OPENAI_AVAILABLE:
@@ -77,6 +115,15 @@ class RAGReferenceSystem:
             self.llm_available = False
             print("📝 Lokale Generierung wird verwendet")
         
+        # Caches: normalisierte Frage -> Antwort, Query-Wörter -> Top-K Chunks
+        self._answer_cache = OrderedDict()
+        self._retrieval_cache = OrderedDict()
+        
+        # Bereinigte Wortmengen (Text, Titel) je Chunk für das Reranking
+        self._cached_wordsets = lru_cache(maxsize=4096)(self._chunk_wordsets)
+        # Bereinigte Query-Wörter: jede Query wird nur einmal tokenisiert
+        self._cached_query_words = lru_cache(maxsize=4096)(self._query_words)
+        
         # Internal Knowledge Base laden
         self._load_knowledge_base()
         
@@ -86,15 +133,72 @@ class RAGReferenceSystem:
         """Lädt die Internal Knowledge Base"""
         print("📚 Lade Internal Knowledge Base...")
         
-        if os.path.exists(self.index_file):
-            with open(self.index_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        index_files = [self.index_file, self.tfidf_file, self.chunk_text_file]
+        if all(os.path.exists(path) for path in index_files):
+            with open(self.index_file, 'rb') as f:
+                data = pickle.load(f)
                 self.chunks = data['chunks']
-                self.word_index = {k: set(v) for k, v in data['word_index'].items()}
-                self.tf_idf_scores = data['tf_idf_scores']
+                self.chunk_offsets = data['chunk_offsets']
+                # Wort -> Spalte der TF-IDF Matrix
+                self.vocabulary = data['vectorizer'].vocabulary_
+            
+            # Chunk-Texte liegen als UTF-8 Blob vor und werden bei Bedarf dekodiert
+            self.chunk_blob = b""
+            if os.path.getsize(self.chunk_text_file) > 0:
+                with open(self.chunk_text_file, 'rb') as f:
+                    self.chunk_blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            
+            # Spaltenweise (CSC) für schnellen Zugriff auf alle Chunks eines Wortes
+            self.tfidf = sparse.load_npz(self.tfidf_file).tocsc()
             print(f"✅ {len(self.chunks)} Dokumente geladen")
         else:
             raise FileNotFoundError("Knowledge Base nicht gefunden! Führe zuerst Basic_Text_Search.py aus.")
+        
+        # Dense Vector Database (optional)
+        self.encoder = None
+        self.dense_index = None
+        if DENSE_AVAILABLE and self.chunks:
+            try:
+                self._load_dense_index()
+            except Exception as e:
+                self.encoder = None
+                self.dense_index = None
+                print(f"⚠️ Dense Index nicht verfügbar ({e}) - verwende TF-IDF Retrieval")
+    
+    def _load_dense_index(self):
+        """Lädt oder berechnet MiniLM-Embeddings aller Chunks und baut den FAISS-Index"""
+        print("🧮 Lade Dense Vector Database...")
+        
+        self.encoder = SentenceTransformer(EMBED_MODEL_NAME)
+        
+        embeddings = None
+        if (os.path.exists(self.embedding_file)
+                and os.path.getmtime(self.embedding_file) >= os.path.getmtime(self.index_file)):
+            embeddings = np.load(self.embedding_file)
+            if embeddings.shape[0] != len(self.chunks):
+                embeddings = None
+        
+        if embeddings is None:
+            print("🔄 Berechne Chunk-Embeddings (einmalig)...")
+            embeddings = self.encoder.encode(
+                [self._chunk_text(i) for i in range(len(self.chunks))],
+                batch_size=64,
+                show_progress_bar=True,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            ).astype(np.float32)
+            np.save(self.embedding_file, embeddings)
+        
+        # Normalisierte Vektoren: Inner Product = Kosinus-Ähnlichkeit
+        dimension = embeddings.shape[1]
+        if len(embeddings) >= HNSW_MIN_CHUNKS:
+            self.dense_index = faiss.IndexHNSWFlat(dimension, 32, faiss.METRIC_INNER_PRODUCT)
+            self.dense_index.hnsw.efSearch = 64
+        else:
+            self.dense_index = faiss.IndexFlatIP(dimension)
+        self.dense_index.add(np.ascontiguousarray(embeddings, dtype=np.float32))
+        
+        print(f"✅ FAISS-Index mit {self.dense_index.ntotal} Vektoren bereit")
     
     def document_retrieval(self, query: str, top_k: int = 5) -> List[RetrievalResult]:
         """
@@ -104,33 +208,53 @@ class RAGReferenceSystem:
         print(f"🔍 Document Retrieval für: '{query}'")
         
         # Query Processing
-        query_words = [self._clean_word(w) for w in query.split()]
+        query_words = self._cached_query_words(query)
         query_words = [w for w in query_words if len(w) > 2]
         
         if not query_words:
             return []
         
-        # Vector Database Matching (TF-IDF basiert)
-        chunk_scores = {}
-        for word in query_words:
-            if word in self.word_index:
-                for chunk_id in self.word_index[word]:
-                    chunk_id_str = str(chunk_id)
-                    if chunk_id_str in self.tf_idf_scores and word in self.tf_idf_scores[chunk_id_str]:
-                        if chunk_id not in chunk_scores:
-                            chunk_scores[chunk_id] = 0
-                        chunk_scores[chunk_id] += self.tf_idf_scores[chunk_id_str][word]
-        
-        # Top-K Selection
-        sorted_chunks = sorted(chunk_scores.items(), key=lambda x: x[1], reverse=True)[:top_k]
+        # Gleiche Query-Wörter liefern dieselben Treffer (Dense: gleiche Query)
+        if self.dense_index is not None:
+            cache_key = (" ".join(query.lower().split()), top_k)
+        else:
+            cache_key = (tuple(query_words), top_k)
+        sorted_chunks = self._cache_lookup(self._retrieval_cache, cache_key)
+        
+        if sorted_chunks is None and self.dense_index is not None:
+            # Vector Database Matching (MiniLM + FAISS)
+            query_embedding = self.encoder.encode(
+                [query], convert_to_numpy=True, normalize_embeddings=True
+            ).astype(np.float32)
+            distances, indices = self.dense_index.search(query_embedding, top_k)
+            sorted_chunks = [
+                (int(chunk_id), float(score))
+                for chunk_id, score in zip(indices[0], distances[0])
+                if chunk_id >= 0
+            ]
+            self._cache_store(self._retrieval_cache, cache_key, sorted_chunks)
+        
+        if sorted_chunks is None:
+            # Vector Database Matching (TF-IDF basiert): eine Sparse-Matrix-Vektor-Multiplikation
+            columns = [self.vocabulary[word] for word in query_words if word in self.vocabulary]
+            scores = self.tfidf[:, columns] @ np.ones(len(columns), dtype=self.tfidf.dtype)
+            candidates = scores.nonzero()[0]
+            
+            # Top-K Selection: O(n) Partition, nur die Top-K werden sortiert
+            top = candidates
+            if len(candidates) > top_k:
+                top = candidates[np.argpartition(scores[candidates], -top_k)[-top_k:]]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            sorted_chunks = [(int(chunk_id), float(scores[chunk_id])) for chunk_id in top]
+            self._cache_store(self._retrieval_cache, cache_key, sorted_chunks)
         
         # Erstelle RetrievalResult Objekte
         results = []
         for chunk_id, score in sorted_chunks:
-            chunk = next(c for c in self.chunks if c['id'] == chunk_id)
+            chunk = self.chunks[chunk_id]  # Chunk-ID = Position (Zeile der TF-IDF Matrix)
             results.append(RetrievalResult(
                 chunk_id=chunk_id,
-                text=chunk['text'],
+                text=self._chunk_text(chunk_id),
                 title=chunk['title'],
                 relevance_score=score,
                 metadata={'paper_id': chunk['paper_id'], 'source': chunk['source']}
@@ -147,18 +271,17 @@ class RAGReferenceSystem:
         print("📊 Reranking & Relevance Processing...")
         
         # Advanced Relevance Scoring
-        query_words = set(self._clean_word(w) for w in query.split())
+        query_words = frozenset(self._cached_query_words(query))
         
         for doc in retrieved_docs:
             # Zusätzliche Relevanz-Faktoren
-            doc_words = set(self._clean_word(w) for w in doc.text.split())
+            doc_words, title_words = self._cached_wordsets(doc.chunk_id)
             
             # Keyword Overlap Bonus
             overlap = len(query_words.intersection(doc_words))
             overlap_bonus = overlap / len(query_words) if query_words else 0
             
             # Title Relevance Bonus  
-            title_words = set(self._clean_word(w) for w in doc.title.split())
             title_overlap = len(query_words.intersection(title_words))
             title_bonus = title_overlap * 0.5
             
@@ -248,37 +371,64 @@ ANTWORT: Basierend auf den bereitgestellten Dokumenten kann ich folgendes antwor
         context_end = prompt.find('FRAGE:')
         context = prompt[context_start:context_end].strip()
         
-        # Einfache Satz-Extraktion basierend auf Query-Keywords
-        query_words = set(self._clean_word(w) for w in query.split())
-        sentences = re.split(r'[.!?]+', context)
-        
-        relevant_sentences = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) < 20:
-                continue
-            
-            sentence_words = set(self._clean_word(w) for w in sentence.split())
-            overlap = len(query_words.intersection(sentence_words))
-            
-            if overlap >= 1:
-                relevant_sentences.append((sentence, overlap))
+        # Einfache Satz-Extraktion basierend auf Query-Keywords (ein Durchlauf ohne Zwischenlisten)
+        query_words = frozenset(self._cached_query_words(query))
+        sentences = (match.group().strip() for match in _SENT_RE.finditer(context))
+        scored = (
+            (sentence, len(query_words.intersection(map(self._clean_word, sentence.split()))))
+            for sentence in sentences if len(sentence) >= 20
+        )
         
-        # Sortiere und kombiniere
-        relevant_sentences.sort(key=lambda x: x[1], reverse=True)
+        # Nur die Top 3 behalten (gleiche Reihenfolge wie stabile Sortierung)
+        relevant_sentences = heapq.nlargest(3, (item for item in scored if item[1] >= 1), key=itemgetter(1))
         
         if relevant_sentences:
             response = "Basierend auf den wissenschaftlichen Dokumenten:\n\n"
-            for sentence, _ in relevant_sentences[:3]:
+            for sentence, _ in relevant_sentences:
                 response += f"• {sentence}.\n"
         else:
             response = "Die gefundenen Dokumente enthalten relevante Informationen, aber keine direkten Antworten zur spezifischen Frage."
         
         return response
     
+    def _chunk_text(self, chunk_id: int) -> str:
+        """Dekodiert den Text eines Chunks aus der Knowledge Base"""
+        start, end = self.chunk_offsets[chunk_id], self.chunk_offsets[chunk_id + 1]
+        return self.chunk_blob[start:end].decode('utf-8')
+    
+    def _query_words(self, query: str) -> Tuple[str, ...]:
+        """Bereinigte Wörter einer Query (in Reihenfolge, inklusive Duplikate)"""
+        return tuple(self._clean_word(w) for w in query.split())
+    
+    def _chunk_wordsets(self, chunk_id: int) -> Tuple[frozenset, frozenset]:
+        """Bereinigte Wörter aus Text und Titel eines Chunks"""
+        doc_words = frozenset(self._clean_word(w) for w in self._chunk_text(chunk_id).split())
+        title_words = frozenset(self._clean_word(w) for w in self.chunks[chunk_id]['title'].split())
+        return doc_words, title_words
+    
     def _clean_word(self, word: str) -> str:
-        """Bereinigt Wörter für Verarbeitung"""
-        return re.sub(r'[^\w\s]', '', word.lower()).strip()
+        """Bereinigt Wörter für Verarbeitung (Wörter stammen aus str.split, enthalten also keine Leerzeichen)"""
+        word = word.lower()
+        # Häufigster Fall: reines Wort ohne Satzzeichen
+        if word.isalnum():
+            return word
+        return _PUNCT_RE.sub('', word)
+    
+    @staticmethod
+    def _cache_lookup(cache: OrderedDict, key):
+        """Liest einen Cache-Eintrag und markiert ihn als zuletzt benutzt"""
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+    
+    @staticmethod
+    def _cache_store(cache: OrderedDict, key, value):
+        """Speichert einen Cache-Eintrag und verdrängt den ältesten (LRU)"""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > QUERY_CACHE_SIZE:
+            cache.popitem(last=False)
     
     def query(self, user_query: str) -> RAGResponse:
         """
@@ -289,6 +439,19 @@ ANTWORT: Basierend auf den bereitgestellten Dokumenten kann ich folgendes antwor
         print(f"🎯 RAG PIPELINE START: {user_query}")
         print(f"{'='*60}")
         
+        # Wiederholte Fragen direkt aus dem Cache beantworten
+        cache_key = " ".join(user_query.lower().split())
+        cached = self._cache_lookup(self._answer_cache, cache_key)
+        if cached is not None:
+            print("⚡ Antwort aus Cache")
+            return replace(cached, query=user_query)
+        
+        response = self._run_pipeline(user_query)
+        self._cache_store(self._answer_cache, cache_key, response)
+        return response
+    
+    def _run_pipeline(self, user_query: str) -> RAGResponse:
+        """Führt Retrieval, Reranking, Prompting und Generierung aus"""
         # 1. Document Retrieval
         retrieved_docs = self.document_retrieval(user_query, top_k=8)
         
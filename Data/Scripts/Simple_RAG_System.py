@@ -17,6 +17,13 @@ Date: 2025
 
 import os
 import re
+import argparse
+import mmap
+import pickle
+import hashlib
+import heapq
+from functools import lru_cache
+from operator import itemgetter
 import numpy as np
 from typing import List, Dict, Tuple
 import warnings
@@ -24,7 +31,9 @@ warnings.filterwarnings("ignore")
 
 try:
     import chromadb
+    import torch
     from sentence_transformers import SentenceTransformer
+    from tqdm.auto import tqdm  # wird mit sentence-transformers installiert
     print("✅ Dependencies erfolgreich importiert")
 except ImportError as e:
     print(f"❌ Import Fehler: {e}")
@@ -32,19 +41,67 @@ except ImportError as e:
     print("pip install chromadb sentence-transformers")
     exit(1)
 
+# Trennlinie zwischen Papers in combined_text.txt (Bytes, da auf der Memory-Map gesucht wird)
+PAPER_SEPARATOR = b"=" * 50
+
+# Int8-quantisiertes ONNX-Modell (dynamische Quantisierung für AVX-512 VNNI),
+# wird im Hub-Repo von all-MiniLM-L6-v2 mitgeliefert
+ONNX_MODEL_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+# Chunk-Größe (Zeichen) und Mindestlänge eines Chunks
+CHUNK_SIZE = 512
+MIN_CHUNK_LENGTH = 50
+
+# Ein Match = ein Chunk: greedy bis CHUNK_SIZE Zeichen, dann zurück zur letzten
+# Satzgrenze (Satzzeichen vor Whitespace) oder zum Textende. Ist schon der erste
+# Satz länger, reicht der Chunk bis zu dessen Ende. Zeilenumbrüche allein gelten
+# nicht als Grenze, da PDF-Text mitten im Satz umbricht.
+_CHUNK_RE = re.compile(
+    r'\S(?:.{0,%d}(?:[.!?](?=\s)|\Z)|.*?(?:[.!?](?=\s)|\Z))' % (CHUNK_SIZE - 2),
+    re.DOTALL
+)
+
+# HNSW-Index der Collection: Skalarprodukt und feste ef-Werte. Die Embeddings
+# sind bereits L2-normalisiert, das Skalarprodukt ist also die Kosinus-Ähnlichkeit
+# (Distanz = 1 - Ähnlichkeit), ohne dass der Index jeden Vektor erneut normalisiert
+HNSW_METADATA = {
+    "hnsw:space": "ip",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64
+}
+
+# Maximale Anzahl gecachter Query-Embeddings und Suchergebnisse (LRU)
+QUERY_CACHE_SIZE = 1024
+
+# Anzahl längensortierter Chunks pro encode()-Aufruf
+EMBED_BATCH_SIZE = 256
+
+# Ab dieser Chunk-Anzahl kodiert PyTorch auf der CPU mit einem Prozess pro Kern
+PARALLEL_MIN_CHUNKS = 10_000
+
+# Einträge pro ChromaDB add()-Aufruf (unter Chromas maximaler Batch-Größe)
+CHROMA_BATCH_SIZE = 5000
+
 class SimpleRAGSystem:
-    def __init__(self, data_dir="../", collection_name="cyber_security_papers"):
+    def __init__(self, data_dir="../", collection_name="cyber_security_papers", reindex=False):
         """
         Initialisiert das Simple RAG-System
         
         Args:
             data_dir: Verzeichnis mit combined_text.txt
             collection_name: Name der ChromaDB Collection
+            reindex: Bestehende Collection verwerfen und neu befüllen
         """
         self.data_dir = data_dir
         self.collection_name = collection_name
+        self.reindex = reindex
         self.text_file = os.path.join(data_dir, "combined_text.txt")
         
+        # Embedding-Cache: Chunks (Pickle, mit Inhalts-Hash) + Embeddings (float16 .npy)
+        self.chunks_file = os.path.join(data_dir, "simple_chunks.pkl")
+        self.embedding_file = os.path.join(data_dir, "simple_embeddings_fp16.npy")
+        
         # Überprüfe ob Textdatei existiert
         if not os.path.exists(self.text_file):
             raise FileNotFoundError(f"Datei nicht gefunden: {self.text_file}")
@@ -53,6 +110,11 @@ class SimpleRAGSystem:
         print(f"📁 Datenquelle: {self.text_file}")
         print(f"📊 Dateigröße: {os.path.getsize(self.text_file):,} bytes")
         
+        # Query-Embeddings und Top-K Ergebnisse je normalisierter Frage:
+        # wiederholte Fragen sparen den Transformer-Forward-Pass und die Suche
+        self._cached_query_embedding = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._embed_query)
+        self._cached_search = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._search)
+        
         # Setup Components
         self.setup_embeddings()
         self.setup_vector_store()
@@ -66,47 +128,104 @@ class SimpleRAGSystem:
         
         # Lade lokales Sentence Transformer Model
         model_name = "sentence-transformers/all-MiniLM-L6-v2"
+        self.model_name = model_name
         print(f"   📦 Lade Model: {model_name}")
         
-        self.embedding_model = SentenceTransformer(model_name)
+        # Mehrere Encode-Prozesse lohnen nur für PyTorch auf der CPU; GPU und
+        # ONNX Runtime lasten die Hardware bereits mit einem Prozess aus
+        self.cpu_torch_backend = False
+        
+        if torch.cuda.is_available():
+            self.embedding_model = SentenceTransformer(model_name)
+            print("   🚀 PyTorch Backend auf GPU")
+        else:
+            # Auf der CPU ist ONNX Runtime mit int8-Gewichten deutlich schneller
+            # als PyTorch FP32; encode() bleibt unverändert nutzbar
+            try:
+                self.embedding_model = SentenceTransformer(
+                    model_name,
+                    backend="onnx",
+                    model_kwargs={"file_name": ONNX_MODEL_FILE, "provider": "CPUExecutionProvider"}
+                )
+                print("   ⚡ ONNX Runtime Backend (int8 quantisiert)")
+            except Exception as e:
+                print(f"   ⚠️ ONNX Backend nicht verfügbar ({e}) - verwende PyTorch")
+                self.embedding_model = SentenceTransformer(model_name)
+                self.cpu_torch_backend = True
         
         print("✅ Embedding Model geladen")
     
-    def setup_vector_store(self):
-        """Setup ChromaDB Vector Store"""
+    def setup_vector_store(self, reset=False):
+        """
+        Setup ChromaDB Vector Store
+        
+        Args:
+            reset: Bestehende Collection vorher löschen
+        """
         print("🗄️ Setup Vector Store...")
         
         # ChromaDB Client (persistent local storage)
         chroma_client = chromadb.PersistentClient(path="../chroma_db")
         
+        if reset:
+            try:
+                chroma_client.delete_collection(self.collection_name)
+            except Exception:
+                pass  # Collection existiert noch nicht
+        
         # Collection erstellen oder laden
         try:
             self.collection = chroma_client.get_collection(self.collection_name)
             print(f"   📦 Bestehende Collection geladen: {self.collection_name}")
         except:
+            self.collection = None
+        
+        # Collections mit anderer Distanz-Metrik (z.B. Chromas Standard L2) neu anlegen
+        if self.collection is not None and (self.collection.metadata or {}).get("hnsw:space") != HNSW_METADATA["hnsw:space"]:
+            print("   🔄 Collection mit anderer Distanz-Metrik - wird neu erstellt")
+            chroma_client.delete_collection(self.collection_name)
+            self.collection = None
+        
+        if self.collection is None:
             self.collection = chroma_client.create_collection(
                 name=self.collection_name,
-                metadata={"description": "Cybersecurity Papers RAG Collection"}
+                metadata={"description": "Cybersecurity Papers RAG Collection", **HNSW_METADATA}
             )
             print(f"   🆕 Neue Collection erstellt: {self.collection_name}")
         
         print("✅ Vector Store konfiguriert")
     
-    def intelligent_text_chunking(self, text: str) -> List[Dict]:
+    def _iter_papers(self, text):
+        """Liefert die Paper-Abschnitte der Memory-Map einzeln dekodiert"""
+        start = 0
+        
+        while True:
+            end = text.find(PAPER_SEPARATOR, start)
+            paper_text = (text[start:] if end == -1 else text[start:end]).decode('utf-8')
+            
+            # Zeilenenden wie beim Lesen im Textmodus vereinheitlichen
+            if '\r' in paper_text:
+                paper_text = paper_text.replace('\r\n', '\n').replace('\r', '\n')
+            yield paper_text
+            
+            if end == -1:
+                return
+            start = end + len(PAPER_SEPARATOR)
+    
+    def intelligent_text_chunking(self, text) -> List[Dict]:
         """
         Intelligente Aufteilung des Textes in semantische Chunks
         
         Args:
-            text: Vollständiger Text aus combined_text.txt
+            text: Memory-Map von combined_text.txt (Papers werden einzeln dekodiert)
             
         Returns:
             List von Dictionaries mit Chunk-Informationen
         """
         print("🧠 Intelligente Text-Segmentierung...")
         
-        # Erkenne Paper-Grenzen
-        paper_separator = "=" * 50
-        papers = text.split(paper_separator)
+        # Erkenne Paper-Grenzen, ohne den ganzen Text zu dekodieren
+        papers = self._iter_papers(text)
         
         chunks = []
         chunk_id = 0
@@ -125,40 +244,21 @@ class SimpleRAGSystem:
                     title = clean_line[:100] + "..." if len(clean_line) > 100 else clean_line
                     break
             
-            # Teile Paper in kleinere Chunks auf
-            sentences = paper_text.split('. ')
-            current_chunk = ""
-            
-            for sentence in sentences:
-                if len(current_chunk + sentence) < 512:  # Chunk-Size Limit
-                    current_chunk += sentence + ". "
-                else:
-                    if len(current_chunk.strip()) > 50:  # Mindestlänge
-                        chunks.append({
-                            "id": f"chunk_{chunk_id}",
-                            "text": current_chunk.strip(),
-                            "metadata": {
-                                "paper_id": f"paper_{i}",
-                                "title": title,
-                                "source": "combined_text.txt"
-                            }
-                        })
-                        chunk_id += 1
-                    
-                    current_chunk = sentence + ". "
-            
-            # Letzter Chunk
-            if len(current_chunk.strip()) > 50:
-                chunks.append({
-                    "id": f"chunk_{chunk_id}",
-                    "text": current_chunk.strip(),
-                    "metadata": {
-                        "paper_id": f"paper_{i}",
-                        "title": title,
-                        "source": "combined_text.txt"
-                    }
-                })
-                chunk_id += 1
+            # Teile Paper in kleinere Chunks auf (ein Regex-Durchlauf,
+            # jeder Chunk ist ein einziger Slice ohne String-Verkettung)
+            for match in _CHUNK_RE.finditer(paper_text):
+                chunk_text = match.group().rstrip()
+                if len(chunk_text) > MIN_CHUNK_LENGTH:
+                    chunks.append({
+                        "id": f"chunk_{chunk_id}",
+                        "text": chunk_text,
+                        "metadata": {
+                            "paper_id": f"paper_{i}",
+                            "title": title,
+                            "source": "combined_text.txt"
+                        }
+                    })
+                    chunk_id += 1
             
             # Progress Update
             if (i + 1) % 10 == 0:
@@ -175,53 +275,174 @@ class SimpleRAGSystem:
         count = self.collection.count()
         if count > 0:
             print(f"   📦 Collection enthält bereits {count} Chunks")
-            user_input = input("   ❓ Neu verarbeiten? (y/n): ").strip().lower()
-            if user_input != 'y':
-                print("   ✅ Verwende bestehende Daten")
+            if not self.reindex:
+                print("   ✅ Verwende bestehende Daten (Neuaufbau mit --reindex)")
                 return
-            else:
-                # Lösche bestehende Daten
-                print("   🗑️ Lösche bestehende Daten...")
-                self.collection.delete()
-        
-        # Lade Textdatei
-        print("   📚 Lade Textdatei...")
-        with open(self.text_file, 'r', encoding='utf-8') as f:
-            text_content = f.read()
-        
-        print(f"   📊 Textgröße: {len(text_content):,} Zeichen")
-        
-        # Intelligente Segmentierung
-        chunks = self.intelligent_text_chunking(text_content)
-        
-        # Erstelle Embeddings und speichere in ChromaDB
-        print("🔢 Erstelle Embeddings...")
-        
-        # Batch-Processing für bessere Performance
-        batch_size = 50
-        for i in range(0, len(chunks), batch_size):
-            batch = chunks[i:i+batch_size]
             
-            # Extrahiere Texte und Metadaten
-            texts = [chunk["text"] for chunk in batch]
-            ids = [chunk["id"] for chunk in batch]
-            metadatas = [chunk["metadata"] for chunk in batch]
+            # Lösche bestehende Daten (Collection neu anlegen)
+            print("   🗑️ Lösche bestehende Daten...")
+            self.setup_vector_store(reset=True)
+        
+        # Unveränderter Text (gleicher Inhalts-Hash): Chunks und Embeddings aus
+        # dem Cache übernehmen, ohne das Modell erneut laufen zu lassen
+        text_hash = self._text_hash()
+        cached = self.load_cached_embeddings(text_hash)
+        if cached is not None:
+            chunks, all_embeddings = cached
+        else:
+            # Textdatei per Memory-Map öffnen: der Gesamttext liegt nie als String im Speicher
+            print("   📚 Lade Textdatei...")
+            print(f"   📊 Textgröße: {os.path.getsize(self.text_file):,} Bytes")
             
-            # Erstelle Embeddings
-            embeddings = self.embedding_model.encode(texts).tolist()
+            chunks = []
+            if os.path.getsize(self.text_file) > 0:
+                with open(self.text_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)  # Aggressives Read-Ahead (Linux/macOS)
+                    
+                    # Intelligente Segmentierung
+                    chunks = self.intelligent_text_chunking(mm)
             
-            # Speichere in ChromaDB
+            all_embeddings = self.embed_chunks(chunks)
+            self.save_cached_embeddings(text_hash, chunks, all_embeddings)
+        
+        all_texts = [chunk["text"] for chunk in chunks]
+        
+        # Speichere in ChromaDB: wenige große add()-Aufrufe statt vieler kleiner
+        # (jeder Aufruf kostet eine SQLite-Transaktion und Validierung).
+        # ChromaDB erwartet float32: Cache-Embeddings (float16) blockweise als
+        # zusammenhängende float32-Blöcke übergeben
+        ids = [chunk["id"] for chunk in chunks]
+        metadatas = [chunk["metadata"] for chunk in chunks]
+        for i in range(0, len(chunks), CHROMA_BATCH_SIZE):
             self.collection.add(
-                embeddings=embeddings,
-                documents=texts,
-                metadatas=metadatas,
-                ids=ids
+                embeddings=np.ascontiguousarray(all_embeddings[i:i+CHROMA_BATCH_SIZE], dtype=np.float32),
+                documents=all_texts[i:i+CHROMA_BATCH_SIZE],
+                metadatas=metadatas[i:i+CHROMA_BATCH_SIZE],
+                ids=ids[i:i+CHROMA_BATCH_SIZE]
             )
             
-            print(f"   📥 Batch {i//batch_size + 1}/{(len(chunks)-1)//batch_size + 1} gespeichert")
+            print(f"   📥 Batch {i//CHROMA_BATCH_SIZE + 1}/{(len(chunks)-1)//CHROMA_BATCH_SIZE + 1} gespeichert")
         
         print(f"✅ {len(chunks)} Chunks indexiert")
     
+    def embed_chunks(self, chunks: List[Dict]) -> np.ndarray:
+        """
+        Erstellt normalisierte Embeddings für alle Chunks
+        
+        Args:
+            chunks: Chunks aus intelligent_text_chunking
+            
+        Returns:
+            float32-Matrix (Chunks x Dimension) in Chunk-Reihenfolge
+        """
+        print("🔢 Erstelle Embeddings...")
+        all_texts = [chunk["text"] for chunk in chunks]
+
+        # Nach Länge sortiert kodieren: ähnlich lange Chunks landen im selben
+        # Batch, dadurch fällt kaum Padding an. Ergebnisse werden über die
+        # Sortier-Indizes wieder an ihre ursprüngliche Position geschrieben.
+        order = np.argsort([len(text) for text in all_texts], kind="stable")
+        dim = self.embedding_model.get_sentence_embedding_dimension()
+        all_embeddings = np.empty((len(all_texts), dim), dtype=np.float32)
+        
+        workers = os.cpu_count() or 1
+        if self.cpu_torch_backend and workers > 1 and len(all_texts) >= PARALLEL_MIN_CHUNKS:
+            all_embeddings[order] = self._encode_parallel([all_texts[j] for j in order], workers)
+            return all_embeddings
+        
+        # Ein Fortschrittsbalken statt Ausgaben pro Batch
+        for start in tqdm(range(0, len(order), EMBED_BATCH_SIZE), desc="   🔢 Embeddings", unit="Batch"):
+            idx = order[start:start + EMBED_BATCH_SIZE]
+            all_embeddings[idx] = self.embedding_model.encode(
+                [all_texts[j] for j in idx],
+                batch_size=128,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+        
+        return all_embeddings
+    
+    def _encode_parallel(self, texts: List[str], workers: int) -> np.ndarray:
+        """
+        Kodiert Texte mit einem Worker-Prozess pro CPU-Kern
+        
+        Die Modellgewichte liegen im Shared Memory und werden nicht kopiert.
+        Jeder Worker bekommt zusammenhängende Blöcke der (längensortierten)
+        Texte und rechnet mit einem Thread, damit sich die Prozesse nicht
+        gegenseitig die Kerne streitig machen.
+        """
+        print(f"   🔀 Kodiere mit {workers} Prozessen...")
+        
+        # Spawn-Worker lesen OMP_NUM_THREADS beim Import von PyTorch
+        previous_threads = os.environ.get("OMP_NUM_THREADS")
+        os.environ["OMP_NUM_THREADS"] = "1"
+        try:
+            pool = self.embedding_model.start_multi_process_pool(["cpu"] * workers)
+        finally:
+            if previous_threads is None:
+                del os.environ["OMP_NUM_THREADS"]
+            else:
+                os.environ["OMP_NUM_THREADS"] = previous_threads
+        
+        try:
+            return self.embedding_model.encode(
+                texts,
+                pool=pool,
+                chunk_size=EMBED_BATCH_SIZE,
+                show_progress_bar=True,
+                batch_size=128,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+        finally:
+            self.embedding_model.stop_multi_process_pool(pool)
+    
+    def _text_hash(self) -> str:
+        """BLAKE2b-Hash von combined_text.txt und Modellname (Schlüssel des Embedding-Caches)"""
+        text_hash = hashlib.blake2b(self.model_name.encode('utf-8'), digest_size=16)
+        if os.path.getsize(self.text_file) > 0:
+            with open(self.text_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text_hash.update(mm)
+        return text_hash.hexdigest()
+    
+    def save_cached_embeddings(self, text_hash: str, chunks: List[Dict], embeddings: np.ndarray):
+        """Speichert Chunks (Pickle) und Embeddings (float16 .npy) für den nächsten Start"""
+        with open(self.chunks_file, 'wb') as f:
+            pickle.dump({"text_hash": text_hash, "chunks": chunks}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # float16 halbiert Datei und Lesebandbreite; bei normalisierten MiniLM-Vektoren
+        # ohne messbaren Einfluss auf das Ranking
+        np.save(self.embedding_file, embeddings.astype(np.float16))
+        
+        print(f"💾 Embeddings gespeichert: {self.embedding_file}")
+    
+    def load_cached_embeddings(self, text_hash: str):
+        """
+        Lädt Chunks und Embeddings aus dem Cache
+        
+        Args:
+            text_hash: Aktueller Inhalts-Hash von combined_text.txt
+            
+        Returns:
+            (chunks, embeddings) oder None, wenn kein passender Cache existiert
+        """
+        if not (os.path.exists(self.chunks_file) and os.path.exists(self.embedding_file)):
+            return None
+        
+        with open(self.chunks_file, 'rb') as f:
+            cache = pickle.load(f)
+        if cache.get("text_hash") != text_hash:
+            print("   🔄 Textdatei wurde geändert - Cache wird neu erstellt")
+            return None
+        
+        # Memory-mapped: das Betriebssystem lädt nur die tatsächlich gelesenen Seiten
+        embeddings = np.load(self.embedding_file, mmap_mode='r')
+        if len(embeddings) != len(cache["chunks"]):
+            return None
+        
+        print(f"   📂 {len(cache['chunks'])} Chunks und Embeddings aus dem Cache geladen")
+        return cache["chunks"], embeddings
+    
     def query(self, question: str, top_k: int = 5) -> Dict:
         """
         Stelle eine Frage an das RAG-System
@@ -236,14 +457,10 @@ class SimpleRAGSystem:
         print(f"\n🤔 Frage: {question}")
         print("🔍 Suche relevante Informationen...")
         
-        # Erstelle Query Embedding
-        query_embedding = self.embedding_model.encode([question]).tolist()
-        
-        # Suche ähnliche Chunks
-        results = self.collection.query(
-            query_embeddings=query_embedding,
-            n_results=top_k
-        )
+        # Suche ähnliche Chunks (MiniLM ist uncased, Groß-/Kleinschreibung und
+        # Leerzeichen ändern das Embedding nicht)
+        normalized_question = " ".join(question.lower().split())
+        results = self._cached_search(normalized_question, top_k)
         
         # Extrahiere relevante Informationen
         relevant_chunks = []
@@ -268,7 +485,7 @@ class SimpleRAGSystem:
         for i, chunk in enumerate(relevant_chunks, 1):
             title = chunk['metadata'].get('title', 'Unknown')
             distance = chunk['distance']
-            print(f"   {i}. {title[:50]}... (Similarity: {1-distance:.3f})")
+            print(f"   {i}. {title[:50]}... (Similarity: {1-distance:.3f})")  # ip-Distanz = 1 - Skalarprodukt
         
         result = {
             'question': question,
@@ -279,6 +496,22 @@ class SimpleRAGSystem:
         
         return result
     
+    def _embed_query(self, normalized_question: str) -> np.ndarray:
+        """Normalisiertes Query-Embedding (schreibgeschützt, da gecacht)"""
+        query_embedding = np.ascontiguousarray(
+            self.embedding_model.encode([normalized_question], convert_to_numpy=True, normalize_embeddings=True),
+            dtype=np.float32
+        )
+        query_embedding.flags.writeable = False
+        return query_embedding
+    
+    def _search(self, normalized_question: str, top_k: int) -> Dict:
+        """Top-K ähnlichste Chunks aus ChromaDB"""
+        return self.collection.query(
+            query_embeddings=self._cached_query_embedding(normalized_question),
+            n_results=top_k
+        )
+    
     def generate_simple_answer(self, question: str, chunks: List[Dict]) -> str:
         """
         Generiert eine einfache Antwort basierend auf relevanten Chunks
@@ -302,22 +535,23 @@ class SimpleRAGSystem:
         
         # Finde relevante Sätze
         sentences = combined_text.split('. ')
-        question_words = set(question.lower().split())
+        question_words = frozenset(question.lower().split())
         
-        relevant_sentences = []
-        for sentence in sentences:
-            sentence_words = set(sentence.lower().split())
-            overlap = len(question_words.intersection(sentence_words))
-            if overlap > 1:  # Mindestens 2 gemeinsame Wörter
-                relevant_sentences.append((sentence, overlap))
+        # intersection() nimmt die Wörter direkt als Iterable entgegen,
+        # so entsteht pro Satz kein eigenes Set
+        scored = (
+            (sentence, len(question_words.intersection(sentence.lower().split())))
+            for sentence in sentences
+        )
         
-        # Sortiere nach Relevanz
-        relevant_sentences.sort(key=lambda x: x[1], reverse=True)
+        # Top 3 nach Relevanz, mindestens 2 gemeinsame Wörter
+        # (gleiche Reihenfolge wie stabile Sortierung)
+        relevant_sentences = heapq.nlargest(3, (item for item in scored if item[1] > 1), key=itemgetter(1))
         
         # Erstelle Antwort
         if relevant_sentences:
             answer = "Basierend auf den gefundenen Dokumenten:\n\n"
-            for sentence, _ in relevant_sentences[:3]:  # Top 3 Sätze
+            for sentence, _ in relevant_sentences:  # Top 3 Sätze
                 answer += f"• {sentence.strip()}.\n"
         else:
             answer = f"Die gefundenen Dokumente enthalten Informationen zu '{question}', aber keine direkten Antworten. Bitte betrachte die angezeigten Quellen für Details."
@@ -372,11 +606,18 @@ class SimpleRAGSystem:
 
 def main():
     """Hauptfunktion"""
+    parser = argparse.ArgumentParser(description="Simple RAG-System mit ChromaDB und Sentence Transformers")
+    parser.add_argument("--reindex", action=argparse.BooleanOptionalAction, default=False,
+                        help="Bestehende Collection verwerfen und neu befüllen (Standard: bestehende Daten verwenden)")
+    parser.add_argument("--data-dir", default="../", help="Verzeichnis mit combined_text.txt")
+    parser.add_argument("--collection", default="cyber_security_papers", help="Name der ChromaDB Collection")
+    args = parser.parse_args()
+    
     print("🚀 Simple RAG-System startet...")
     
     try:
         # RAG-System initialisieren
-        rag = SimpleRAGSystem()
+        rag = SimpleRAGSystem(data_dir=args.data_dir, collection_name=args.collection, reindex=args.reindex)
         
         # Test-Fragen
         test_questions = [